@@ -0,0 +1,155 @@
+# Import necessary libraries
+import os  # Used for accessing environment variables
+from contextlib import asynccontextmanager  # Used to expose the session as an async context manager
+from playwright.async_api import async_playwright  # The main library for browser automation
+from dotenv import load_dotenv  # Used to load credentials from a .env file
+import aiohttp  # Lightweight HTTP client for the API calls after login
+from yarl import URL  # Used to scope the transferred cookies to the admin host
+import asyncio  # The library for running asynchronous Python code
+
+# Load environment variables from a .env file in the same directory
+load_dotenv()
+
+# --- Configuration ---
+# Retrieve Atlassian credentials and Organization ID from environment variables
+# This is a secure way to handle sensitive data without hardcoding it in the script.
+ATLASSIAN_EMAIL = os.getenv("ATLASSIAN_EMAIL")
+ATLASSIAN_PASSWORD = os.getenv("ATLASSIAN_PASSWORD")
+ORG_ID = "e487b234-1e3a-4c58-b4b2-1343fcb828b8"
+
+# The name of the cookie that carries the CSRF token required by the
+# admin APIs. Its value must be echoed back in the 'atl-token' header.
+CSRF_COOKIE_NAME = "atlassian.account.xsrf.token"
+
+async def login(page):
+    """
+    Automates the login process for the Atlassian admin console.
+    It navigates to the login page, enters credentials, and waits for a successful login.
+    """
+    print("Navigating to login page...")
+    await page.goto("https://admin.atlassian.com")
+
+    # Locate the email input field, wait for it to be ready, and fill it
+    await page.wait_for_selector('input[name="username"]')
+    await page.locator('input[name="username"]').fill(ATLASSIAN_EMAIL)
+    await page.locator('button[id="login-submit"]').click()
+
+    # After submitting the email, locate the password field, wait, and fill it
+    await page.wait_for_selector('input[name="password"]')
+    await page.locator('input[name="password"]').fill(ATLASSIAN_PASSWORD)
+    await page.locator('button[id="login-submit"]').click()
+
+    print("Login successful! Waiting for dashboard to load...")
+    # To confirm a successful login, wait for a specific, stable element on the dashboard page.
+    # This ensures the page is fully loaded before the script proceeds.
+    await page.wait_for_selector('span:has-text("sample overview")')
+    print("Successfully logged in.")
+
+async def get_csrf_token(page):
+    """
+    Reads the CSRF token from the browser's cookies after login.
+    The admin APIs reject state-changing requests that don't echo this
+    token back in the 'atl-token' header.
+    """
+    # The dashboard sets its cookies shortly after load, so poll for the
+    # token instead of sleeping a fixed two seconds: the common case returns
+    # almost immediately, and slow loads still get up to two seconds.
+    for _ in range(20):
+        cookies = await page.context.cookies()
+        for cookie in cookies:
+            if cookie["name"] == CSRF_COOKIE_NAME:
+                return cookie["value"]
+        await asyncio.sleep(0.1)
+    raise RuntimeError("Could not find the CSRF token cookie after login.")
+
+# --- Bounded, retrying request helpers ---
+# One module-level semaphore bounds every admin API call in both scripts.
+# The individual fetches are free to fan out with asyncio.gather; this cap
+# is what keeps the combined concurrency under the API's rate limits so the
+# parallelism doesn't dissolve into 429 retry storms.
+API_CONCURRENCY = asyncio.Semaphore(8)
+
+# Backoff schedule for retrying throttled (429) or server-error (5xx)
+# responses before giving up and returning the last response as-is.
+RETRY_DELAYS = (0.5, 1.0, 2.0, 4.0)
+
+async def _request_with_retry(method, url, **kwargs):
+    """
+    Issues a request under the shared semaphore, retrying with exponential
+    backoff when the API throttles (429) or errors server-side (5xx).
+    """
+    async with API_CONCURRENCY:
+        for delay in RETRY_DELAYS:
+            response = await method(url, **kwargs)
+            if response.status != 429 and response.status < 500:
+                return response
+            # Release the failed response so its connection goes back to
+            # the pool before sleeping and trying again.
+            response.release()
+            print(f"Retrying after HTTP {response.status}: {url}")
+            await asyncio.sleep(delay)
+        # Out of retries: hand the last response back and let the caller's
+        # own error handling report it.
+        return await method(url, **kwargs)
+
+async def aget(api, url):
+    """GETs a URL through the shared semaphore with 429/5xx retries."""
+    return await _request_with_retry(api.get, url)
+
+async def apost(api, url, headers=None, data=None):
+    """POSTs to a URL through the shared semaphore with 429/5xx retries."""
+    return await _request_with_retry(api.post, url, headers=headers, data=data)
+
+class AtlassianSession:
+    """
+    Bundles the logged-in browser page, the shared HTTP session for API
+    calls, and the CSRF token so scripts can share a single login flow.
+    """
+
+    def __init__(self, page, api, csrf_token):
+        self.page = page
+        self.api = api
+        self.csrf_token = csrf_token
+
+@asynccontextmanager
+async def open_session():
+    """
+    Launches a browser, logs in once, and yields an AtlassianSession.
+    The session's HTTP client reuses one keep-alive connection pool for
+    every call, and both the client and the browser are closed when the
+    block exits — so scripts that run back-to-back (setup, then
+    verification) pay for a single browser launch and login each.
+    """
+    # Use async with to ensure the Playwright browser is always closed properly.
+    async with async_playwright() as p:
+        # Launch the browser. Set headless=False to watch the script in action.
+        browser = await p.chromium.launch(headless=True)
+        page = await browser.new_page()
+        api = None
+
+        try:
+            await login(page)
+            csrf_token = await get_csrf_token(page)
+
+            # Once logged in, the browser is only needed for its cookies — the
+            # API polling itself doesn't need Playwright's CDP machinery. Seed
+            # an aiohttp session with the login cookies instead: it has a much
+            # lighter per-request path and its connector reuses one keep-alive
+            # connection pool across every call, so no request pays for a
+            # fresh TLS handshake.
+            cookies = await page.context.cookies()
+            jar = aiohttp.CookieJar()
+            jar.update_cookies(
+                {cookie["name"]: cookie["value"] for cookie in cookies},
+                response_url=URL("https://admin.atlassian.com"),
+            )
+            api = aiohttp.ClientSession(
+                cookie_jar=jar,
+                connector=aiohttp.TCPConnector(limit=16),
+            )
+            yield AtlassianSession(page, api, csrf_token)
+        finally:
+            # Ensure the HTTP session and browser are closed even if an error occurs.
+            if api is not None:
+                await api.close()
+            await browser.close()
@@ -1,77 +1,123 @@
 # Import necessary libraries
-import os  # Used for accessing environment variables
-import json  # Used for handling JSON data (reading/writing files)
-from playwright.async_api import async_playwright  # The main library for browser automation
-from dotenv import load_dotenv  # Used to load credentials from a .env file
+import os  # Used for accessing the on-disk response cache
+import math  # Used to compute how many user pages need to be fetched
+import time  # Used to check cache freshness against the TTL
+import hashlib  # Used to derive cache filenames from API URLs
+import orjson  # Fast C-based JSON serialization for writing the output files
 import asyncio  # The library for running asynchronous Python code
+from operator import itemgetter  # C-level field extraction for JSON shaping
+from auth import open_session, aget, ORG_ID  # Shared login/session handling for both scripts
 
-# Load environment variables from a .env file in the same directory
-load_dotenv()
+# --- Response cache ---
+# Responses are cached on disk so repeated runs during development return
+# instantly instead of refetching every page. Each cached response lives in
+# its own file under CACHE_DIR, named by a hash of the request URL, and is
+# considered fresh while younger than its TTL. User listings change more
+# often than the groups list, so they get a shorter TTL.
+CACHE_DIR = ".cache"
+USERS_CACHE_TTL = 900  # 15 minutes
+GROUPS_CACHE_TTL = 3600  # 1 hour
 
-# --- Configuration ---
-# Retrieve Atlassian credentials and Organization ID from environment variables
-# This is a secure way to handle sensitive data without hardcoding it in the script.
-ATLASSIAN_EMAIL = os.getenv("ATLASSIAN_EMAIL")
-ATLASSIAN_PASSWORD = os.getenv("ATLASSIAN_PASSWORD")
-ORG_ID = "e487b234-1e3a-4c58-b4b2-1343fcb828b8" 
-BASE_URL = f"https://admin.atlassian.com/o/{ORG_ID}/"
-
-async def login(page):
+async def cached_get(api, url, ttl=GROUPS_CACHE_TTL):
     """
-    Automates the login process for the Atlassian admin console.
-    It navigates to the login page, enters credentials, and waits for a successful login.
+    GETs a URL through the API request context with an on-disk cache.
+    Returns the parsed JSON body, served from the cache when a response
+    for the same URL was stored within the last ttl seconds.
     """
-    print("Navigating to login page...")
-    await page.goto("https://admin.atlassian.com")
-    
-    # Locate the email input field, wait for it to be ready, and fill it
-    await page.wait_for_selector('input[name="username"]')
-    await page.locator('input[name="username"]').fill(ATLASSIAN_EMAIL)
-    await page.locator('button[id="login-submit"]').click()
-    
-    # After submitting the email, locate the password field, wait, and fill it
-    await page.wait_for_selector('input[name="password"]')
-    await page.locator('input[name="password"]').fill(ATLASSIAN_PASSWORD)
-    await page.locator('button[id="login-submit"]').click()
-    
-    print("Login successful! Waiting for dashboard to load...")
-    # To confirm a successful login, wait for a specific, stable element on the dashboard page.
-    # This ensures the page is fully loaded before the script proceeds.
-    await page.wait_for_selector('span:has-text("sample overview")')
-    print("Successfully logged in.")
-
-async def fetch_users(page):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    cache_path = os.path.join(CACHE_DIR, hashlib.sha256(url.encode()).hexdigest() + ".json")
+    try:
+        # A missing file raises OSError, which simply means a cache miss.
+        if time.time() - os.path.getmtime(cache_path) < ttl:
+            with open(cache_path, "rb") as f:
+                return orjson.loads(f.read())
+    except OSError:
+        pass
+
+    response = await aget(api, url)
+    # aget hands back the last 429/5xx response once its retries run out;
+    # surface that as an error rather than caching a non-JSON error body
+    # that would poison every rerun until the TTL expires.
+    if not response.ok:
+        raise RuntimeError(f"GET {url} failed: HTTP {response.status} {await response.text()}")
+    body = await response.read()
+    with open(cache_path, "wb") as f:
+        f.write(body)
+    return orjson.loads(body)
+
+# Page size for user listings. A high limit reduces the number of required API calls.
+USERS_PAGE_LIMIT = 200
+
+# Cap on how many user pages are requested at the same time during the
+# offset fan-out below, to stay under the API's rate limits.
+USER_FETCH_CONCURRENCY = asyncio.Semaphore(8)
+
+async def _fetch_users_page(api, url):
+    """Fetches one page of users, bounded by the fan-out semaphore."""
+    async with USER_FETCH_CONCURRENCY:
+        print(f"Fetching from: {url}")
+        return await cached_get(api, url, ttl=USERS_CACHE_TTL)
+
+async def fetch_users(api):
     """
     Fetches all user accounts from the Atlassian organization by making direct API calls.
     [cite_start]This method is preferred over web scraping as it's faster and more reliable. [cite: 33]
     [cite_start]It also handles pagination to ensure all users are retrieved. [cite: 10]
     """
     print("Fetching all users...")
-    all_users = []
-    
+
     # This is the specific API endpoint for fetching user data.
-    # Using a high limit reduces the number of required API calls.
-    next_url = f"https://admin.atlassian.com/gateway/api/admin/v2/orgs/{ORG_ID}/directories/-/users?limit=100"
-
-    # Loop as long as the API response provides a 'next' link for the next page of results.
-    while next_url:
-        print(f"Fetching from: {next_url}")
-        # Use the page's authenticated context to make the GET request.
-        # This automatically includes the necessary login cookies.
-        api_response = await page.request.get(next_url)
-        data = await api_response.json()
-        
-        # Extend our list of users with the users found on the current page.
-        all_users.extend(data.get("data", []))
-        
-        # Get the URL for the next page from the 'links' object in the response.
-        # If there is no 'next' link, the value will be None, and the loop will terminate.
+    base_url = f"https://admin.atlassian.com/gateway/api/admin/v2/orgs/{ORG_ID}/directories/-/users?limit={USERS_PAGE_LIMIT}"
+
+    # Fetch the first page to learn how many users there are in total.
+    print(f"Fetching from: {base_url}")
+    data = await cached_get(api, base_url, ttl=USERS_CACHE_TTL)
+    all_users = data.get("data", [])
+
+    # If the response reports a total, every remaining page URL is known up
+    # front, so fetch them all concurrently instead of walking 'next' links
+    # one round-trip at a time. The semaphore bounds the fan-out. Only take
+    # this path when the first page actually came back at the requested
+    # limit — a server that clamps the page size would make fixed offsets
+    # skip records — and stride by the size the server actually returned.
+    total = data.get("meta", {}).get("total") or data.get("total")
+    page_size = len(all_users)
+    if total and total > page_size and page_size == USERS_PAGE_LIMIT:
+        page_count = math.ceil(total / page_size)
+        urls = [f"{base_url}&offset={i * page_size}" for i in range(1, page_count)]
+        pages = await asyncio.gather(*(_fetch_users_page(api, url) for url in urls))
+        # Merge the pages in order so the output is deterministic.
+        for page_data in pages:
+            all_users.extend(page_data.get("data", []))
+    else:
+        # No total available: fall back to following the 'next' links, but
+        # keep the next request in flight while the current page is processed.
         next_url = data.get("links", {}).get("next", None)
+        pending = asyncio.ensure_future(cached_get(api, next_url, ttl=USERS_CACHE_TTL)) if next_url else None
+        while pending:
+            data = await pending
+
+            # If there is another 'next' link, kick off its request immediately
+            # so it is in flight while we process the current page.
+            next_url = data.get("links", {}).get("next", None)
+            if next_url:
+                print(f"Fetching from: {next_url}")
+                pending = asyncio.ensure_future(cached_get(api, next_url, ttl=USERS_CACHE_TTL))
+            else:
+                pending = None
+
+            # Extend our list of users with the users found on the current page.
+            all_users.extend(data.get("data", []))
 
     print(f"✅ Total users fetched: {len(all_users)}")
     return all_users
 
-async def fetch_group_members(page, group_id):
+# Limit how many member-fetches run at the same time. The fetches are fired
+# concurrently per page of groups, and without a cap a large organization could
+# hammer the API with dozens of simultaneous requests and trigger rate limiting.
+MEMBER_FETCH_CONCURRENCY = asyncio.Semaphore(10)
+
+async def fetch_group_members(api, group_id):
     """
     For a given group ID, fetches all members belonging to that group.
     This function also handles pagination for groups that have a large number of members.
@@ -80,27 +126,37 @@ async def fetch_group_members(page, group_id):
     start_index = 1
     count = 50 # Fetch members in batches of 50
 
-    # This loop continues until a page with no members is returned, indicating the end.
-    while True:
-        # This is the specific API endpoint for fetching members of a particular group.
-        url = f"https://admin.atlassian.com/gateway/api/adminhub/um/org/{ORG_ID}/groups/{group_id}/members?count={count}&start-index={start_index}"
-        response = await page.request.get(url)
-        data = await response.json()
-        
-        # The API response for members nests the list under the "users" key.
-        members_on_page = data.get("users", [])
-        
-        # If the list of members on the current page is empty, we've fetched everyone.
-        if not members_on_page:
-            break
-        
-        all_members.extend(members_on_page)
-        # Increment the start_index for the next page request.
-        start_index += count
-    
+    # The semaphore caps how many groups are being fetched concurrently when
+    # fetch_groups fans these calls out with asyncio.gather.
+    async with MEMBER_FETCH_CONCURRENCY:
+        # This loop continues until a page with no members is returned, indicating the end.
+        while True:
+            # This is the specific API endpoint for fetching members of a particular group.
+            url = f"https://admin.atlassian.com/gateway/api/adminhub/um/org/{ORG_ID}/groups/{group_id}/members?count={count}&start-index={start_index}"
+            data = await cached_get(api, url, ttl=GROUPS_CACHE_TTL)
+
+            # The API response for members nests the list under the "users" key.
+            members_on_page = data.get("users", [])
+
+            # If the list of members on the current page is empty, we've fetched everyone.
+            if not members_on_page:
+                break
+
+            all_members.extend(members_on_page)
+
+            # A short page means this was the last one, so stop here instead
+            # of paying one more round-trip just to see an empty response.
+            # The reported total, when present, confirms the same thing.
+            total = data.get("total")
+            if len(members_on_page) < count or (total is not None and len(all_members) >= total):
+                break
+
+            # Increment the start_index for the next page request.
+            start_index += count
+
     return all_members
 
-async def fetch_groups(page):
+async def fetch_groups(api):
     """
     Fetches all groups in the organization and then fetches the members for each group.
     It first gets a list of all groups and then iterates through them to populate their member lists.
@@ -115,21 +171,34 @@ async def fetch_groups(page):
         # The API endpoint for fetching the list of groups.
         url = f"https://admin.atlassian.com/gateway/api/adminhub/um/org/{ORG_ID}/groups?count={count}&start-index={start_index}"
         print(f"Fetching groups list from: {url}")
-        
-        api_response = await page.request.get(url)
-        data = await api_response.json()
-        
+
+        data = await cached_get(api, url, ttl=GROUPS_CACHE_TTL)
+
         # The API response for groups nests the list under the "groups" key.
         groups_on_page = data.get("groups", [])
             
         if not groups_on_page:
             break
         
-        # For each group found, call the helper function to fetch its members.
+        # Groups that report zero members don't need a member fetch at all;
+        # give them an empty list up front. When no memberCount is reported,
+        # assume the group has members and fetch normally.
+        groups_to_fetch = []
         for group in groups_on_page:
-            print(f"---> Fetching members for group: {group['name']}")
-            members = await fetch_group_members(page, group['id'])
-            # Add the fetched list of members as a new key to the group object.
+            if group.get('memberCount', 1) == 0:
+                group['members'] = []
+            else:
+                print(f"---> Fetching members for group: {group['name']}")
+                groups_to_fetch.append(group)
+
+        # The member lists for the remaining groups are independent of each
+        # other, so fetch them all concurrently instead of one at a time.
+        # The semaphore inside fetch_group_members keeps the fan-out polite.
+        member_lists = await asyncio.gather(
+            *(fetch_group_members(api, group['id']) for group in groups_to_fetch)
+        )
+        # Add each fetched list of members as a new key on its group object.
+        for group, members in zip(groups_to_fetch, member_lists):
             group['members'] = members
 
         all_groups.extend(groups_on_page)
@@ -139,7 +208,15 @@ async def fetch_groups(page):
     print(f"✅ Total groups fetched: {len(all_groups)}")
     return all_groups
 
-def save_to_json(users_data, groups_data):
+def _write_json_file(path, payload):
+    """Serializes payload with orjson and writes the bytes to path."""
+    # orjson produces bytes, so the file is opened in binary mode. Its C
+    # serializer is several times faster than the stdlib json module on
+    # large user/group listings.
+    with open(path, "wb") as f:
+        f.write(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+
+async def save_to_json(users_data, groups_data):
     """
     [cite_start]Processes the raw user and group data to create two final JSON files. [cite: 11]
     It cross-references the data to link users to their groups and vice-versa,
@@ -156,33 +233,45 @@ def save_to_json(users_data, groups_data):
 
     # --- Step 2: Populate the map with group memberships ---
     # Iterate through each group and its members to build the relationship.
+    # This is the hottest loop in the function (one iteration per membership),
+    # so pre-bind the map's .get method and use it to both test for and fetch
+    # the bucket in a single hash lookup, instead of `in` followed by `[]`.
+    get_group_bucket = user_to_groups_map.get
     for group in groups_data:
         group_name = group.get("name")
         for member in group.get('members', []):
             # The member object from the member list uses the key 'id' for the user's accountId.
-            member_id = member.get('id') 
             # If the member's ID exists in our user map, add the group name to their list.
-            if member_id in user_to_groups_map:
-                user_to_groups_map[member_id].append(group_name)
+            bucket = get_group_bucket(member.get('id'))
+            if bucket is not None:
+                bucket.append(group_name)
 
     # --- Step 3: Generate and save users.json ---
     # [cite_start]Format the user data according to the assessment requirements. [cite: 12]
+    # Extract all five fields per user with one precompiled itemgetter (a C
+    # function) instead of five Python-level .get calls. itemgetter raises
+    # KeyError on a missing field, so users missing any of the keys are
+    # filled in with None up front; in practice the directory API returns
+    # all five, so this normalization almost never copies.
+    user_fields = ("accountId", "name", "email", "last_active_date", "status")
+    user_fields_set = frozenset(user_fields)
+    get_user_fields = itemgetter(*user_fields)
     users_output = [
         {
-            "id": user.get("accountId"),
-            "name": user.get("name"),
-            "email": user.get("email"),
-            "last_active": user.get("last_active_date"),
-            "status": user.get("status"),
+            "id": account_id,
+            "name": name,
+            "email": email,
+            "last_active": last_active,
+            "status": status,
             # Get the list of group names for this user from the map we created.
-            "groups": user_to_groups_map.get(user.get("accountId"), [])
+            "groups": user_to_groups_map.get(account_id, [])
         }
-        for user in users_data
+        for account_id, name, email, last_active, status in map(
+            get_user_fields,
+            (user if user.keys() >= user_fields_set else {**dict.fromkeys(user_fields), **user}
+             for user in users_data),
+        )
     ]
-    with open("users.json", "w") as f:
-        json.dump(users_output, f, indent=4)
-    print("Saved users.json")
-
     # --- Step 4: Generate and save groups.json ---
     # [cite_start]Format the group data according to the assessment requirements. [cite: 20]
     groups_output = [
@@ -195,37 +284,33 @@ def save_to_json(users_data, groups_data):
         }
         for group in groups_data
     ]
-    with open("groups.json", "w") as f:
-        json.dump(groups_output, f, indent=4)
+    # The two files are independent, so serialize and write them in worker
+    # threads concurrently instead of blocking the event loop on disk I/O.
+    await asyncio.gather(
+        asyncio.to_thread(_write_json_file, "users.json", users_output),
+        asyncio.to_thread(_write_json_file, "groups.json", groups_output),
+    )
+    print("Saved users.json")
     print("Saved groups.json")
 
 async def main():
     """The main function that orchestrates the entire automation process."""
-    # Use async with to ensure the Playwright browser is always closed properly.
-    async with async_playwright() as p:
-        # Launch the browser. Set headless=False to watch the script in action.
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
-        
-        try:
-            # The script executes the main steps in sequence.
-            await login(page)
-            
+    try:
+        # open_session handles the browser launch, login, and the shared API
+        # request context, and cleans all of them up when the block exits.
+        async with open_session() as session:
             # Fetch all user and group data from the Atlassian APIs.
-            users = await fetch_users(page)
-            groups = await fetch_groups(page)
-            
+            users = await fetch_users(session.api)
+            groups = await fetch_groups(session.api)
+
             # Process and save the collected data into the final JSON files.
-            save_to_json(users, groups)
-            
+            await save_to_json(users, groups)
+
             print("\n🎉 Script finished successfully!")
 
-        except Exception as e:
-            # Basic error handling to catch any exceptions during the run.
-            print(f"An error occurred: {e}")
-        finally:
-            # Ensure the browser is closed even if an error occurs.
-            await browser.close()
+    except Exception as e:
+        # Basic error handling to catch any exceptions during the run.
+        print(f"An error occurred: {e}")
 
 # This is the standard entry point for a Python script.
 if __name__ == "__main__":
@@ -0,0 +1,136 @@
+# Import necessary libraries
+import json  # Used for serializing API request payloads
+from urllib.parse import quote  # Used to encode emails into query strings
+from faker import Faker  # Used to generate realistic sample user data
+import asyncio  # The library for running asynchronous Python code
+from auth import open_session, aget, apost, ORG_ID  # Shared login/session handling for both scripts
+
+# --- Sample data to seed the organization with ---
+# A handful of groups that the fetched data in login.py can be verified against.
+GROUPS_TO_CREATE = [
+    {"name": "engineering", "description": "All engineers in the organization"},
+    {"name": "design", "description": "Product and visual designers"},
+    {"name": "marketing", "description": "Marketing and growth team"},
+    {"name": "support", "description": "Customer support specialists"},
+    {"name": "leadership", "description": "Org leadership and management"},
+]
+
+# Generate a deterministic set of sample users with Faker so repeated runs
+# produce the same invitations.
+fake = Faker()
+Faker.seed(42)
+USERS_TO_INVITE = [
+    {"email": fake.unique.email(), "group": GROUPS_TO_CREATE[i % len(GROUPS_TO_CREATE)]["name"]}
+    for i in range(10)
+]
+
+async def create_group(api, name, description, headers):
+    """
+    Creates a single group via the admin API and returns its new group ID.
+    The request goes through Playwright's request context, which shares the
+    browser's session cookies automatically.
+    """
+    print(f"Creating group: {name}")
+    url = f"https://admin.atlassian.com/gateway/api/adminhub/um/org/{ORG_ID}/groups"
+    payload = {"name": name, "description": description}
+    response = await apost(api, url, headers=headers, data=json.dumps(payload))
+    if not response.ok:
+        raise RuntimeError(f"Failed to create group '{name}': HTTP {response.status} {await response.text()}")
+    return (await response.json()).get("id")
+
+async def invite_users(api, emails, headers):
+    """
+    Invites a batch of users by email and returns their new account IDs,
+    in the same order as the given emails. The invite endpoint accepts a
+    list of emails, so the whole batch goes out in a single POST instead
+    of one request per user.
+    """
+    print(f"Inviting {len(emails)} users...")
+    url = f"https://admin.atlassian.com/gateway/api/adminhub/um/org/{ORG_ID}/users/invite"
+    payload = {"emails": emails}
+    response = await apost(api, url, headers=headers, data=json.dumps(payload))
+    if not response.ok:
+        raise RuntimeError(f"Failed to invite users: HTTP {response.status} {await response.text()}")
+
+    # The invite response doesn't include account IDs, so look each user up
+    # in the directory, concurrently across the batch.
+    return await asyncio.gather(*(_wait_for_account_id(api, email) for email in emails))
+
+async def _wait_for_account_id(api, email):
+    """
+    Searches the directory for an invited user's account ID.
+    The invitation registers asynchronously on Atlassian's side, so poll
+    with exponential backoff and return as soon as the user appears.
+    """
+    # Encode the email: characters like '+' are legal in email addresses
+    # but mean a space in a raw query string, which would never match.
+    search_url = (
+        f"https://admin.atlassian.com/gateway/api/admin/v2/orgs/{ORG_ID}"
+        f"/directories/-/users?limit=1&search={quote(email, safe='')}"
+    )
+    for delay in (0, 0.25, 0.5, 1.0, 2.0, 4.0):
+        await asyncio.sleep(delay)
+        response = await aget(api, search_url)
+        data = await response.json()
+        matches = data.get("data", [])
+        if matches:
+            return matches[0].get("accountId")
+    raise RuntimeError(f"Invited user '{email}' did not appear in the directory.")
+
+async def add_user_to_group(api, account_id, group_id, headers):
+    """Adds an already-invited user to a group via the admin API."""
+    url = f"https://admin.atlassian.com/gateway/api/adminhub/um/org/{ORG_ID}/groups/{group_id}/members"
+    payload = {"users": [account_id]}
+    response = await apost(api, url, headers=headers, data=json.dumps(payload))
+    if not response.ok:
+        raise RuntimeError(
+            f"Failed to add user {account_id} to group {group_id}: HTTP {response.status} {await response.text()}"
+        )
+
+async def main():
+    """The main function that orchestrates the organization seeding process."""
+    try:
+        # open_session handles the browser launch, login, CSRF token, and the
+        # shared API request context, and cleans all of them up on exit.
+        async with open_session() as session:
+            api = session.api
+            # Every admin API call sends the same two headers, so build the
+            # dict once here instead of rebuilding it inside each helper.
+            headers = {"Content-Type": "application/json", "atl-token": session.csrf_token}
+
+            # --- Phase 1: create all groups concurrently ---
+            # The groups are independent of each other, so create them all at
+            # once instead of waiting one round-trip per group.
+            group_ids = await asyncio.gather(
+                *(create_group(api, g["name"], g["description"], headers) for g in GROUPS_TO_CREATE)
+            )
+            group_id_map = {g["name"]: gid for g, gid in zip(GROUPS_TO_CREATE, group_ids)}
+            print(f"✅ Created {len(group_id_map)} groups.")
+
+            # --- Phase 2: invite all users in one batched call ---
+            # The invite endpoint takes a list of emails, so the whole batch
+            # is a single POST; only the account-ID lookups fan out.
+            account_ids = await invite_users(
+                api, [u["email"] for u in USERS_TO_INVITE], headers
+            )
+            print(f"✅ Invited {len(account_ids)} users.")
+
+            # --- Phase 3: assign every user to their group concurrently ---
+            await asyncio.gather(
+                *(
+                    add_user_to_group(api, account_id, group_id_map[user["group"]], headers)
+                    for user, account_id in zip(USERS_TO_INVITE, account_ids)
+                )
+            )
+            print("✅ Assigned all users to their groups.")
+
+            print("\n🎉 Setup finished successfully!")
+
+    except Exception as e:
+        # Basic error handling to catch any exceptions during the run.
+        print(f"An error occurred: {e}")
+
+# This is the standard entry point for a Python script.
+if __name__ == "__main__":
+    # asyncio.run() starts the execution of our async main function.
+    asyncio.run(main())